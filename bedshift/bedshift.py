@@ -3,13 +3,14 @@
 import logging
 import logmuse
 import math
+import multiprocessing
 import numpy as np
 import os
 import pandas as pd
-import pyranges as pr
-import random
 import sys
 
+from ncls import NCLS
+
 from bedshift._version import __version__
 from bedshift import arguments
 from bedshift import BedshiftYAMLHandler
@@ -18,32 +19,87 @@ _LOGGER = logging.getLogger(__name__)
 
 __all__ = ["Bedshift"]
 
+# the modification column records which perturbation produced each region
+_MODIFICATIONS = pd.CategoricalDtype(["-", "A", "S", "C", "M"])
+
+
+def _parse_seed(seednum):
+    """
+    Convert a seed to a non-negative integer, exiting if that is not possible
+
+    :param int seednum: the seed, possibly given as a string
+    :return int: the seed
+    """
+    try:
+        seed = int(seednum)
+    except ValueError:
+        seed = -1
+    if seed < 0:
+        _LOGGER.error("Seed should be a non-negative integer, not {}.".format(seednum))
+        sys.exit(1)
+    return seed
+
+
+def _shift_regions(starts, ends, chrom_lens, shifts):
+    """
+    Shift regions and check that they stay within their chromosome
+
+    :param np.ndarray starts: the region starts
+    :param np.ndarray ends: the region ends
+    :param np.ndarray chrom_lens: the length of each region's chromosome
+    :param np.ndarray shifts: the shift distance of each region
+    :return np.ndarray, np.ndarray, np.ndarray new_starts, new_ends, valid: shifted regions and which of them are in bounds
+    """
+    new_starts = starts + shifts
+    new_ends = ends + shifts
+    valid = (new_starts >= 0) & (new_ends <= chrom_lens)
+    return new_starts, new_ends, valid
+
+
+def _cut_points(starts, ends):
+    """
+    Choose where to cut regions, keeping both halves non-empty where possible
+
+    :param np.ndarray starts: the region starts
+    :param np.ndarray ends: the region ends
+    :return np.ndarray: the cut position of each region
+    """
+    thecuts = (starts + ends) // 2
+    thecuts = np.where(thecuts <= starts, starts + 10, thecuts)
+    thecuts = np.where(thecuts >= ends, ends - 10, thecuts)
+    return thecuts
+
 
 class Bedshift(object):
     """
     The bedshift object with methods to perturb regions
     """
 
-    def __init__(self, bedfile_path, chrom_sizes=None, delimiter="\t"):
+    def __init__(self, bedfile_path, chrom_sizes=None, delimiter="\t", seed=None):
         """
         Read in a .bed file to pandas DataFrame format
 
         :param str bedfile_path: the path to the BED file
         :param str chrom_sizes: the path to the chrom.sizes file
         :param str delimiter: the delimiter used in the BED file
+        :param int seed: a seed for allowing reproducible perturbations
         """
         self.bedfile_path = bedfile_path
+        self._rng = np.random.default_rng(seed)
         self.chrom_lens = {}
         if chrom_sizes:
             self._read_chromsizes(chrom_sizes)
         df = self.read_bed(bedfile_path, delimiter=delimiter)
         self.original_num_regions = df.shape[0]
         self.bed = (
-            df.astype({0: "object", 1: "int64", 2: "int64", 3: "object"})
+            df.astype({0: "category", 1: "int64", 2: "int64", 3: _MODIFICATIONS})
             .sort_values([0, 1, 2])
             .reset_index(drop=True)
         )
-        self.original_bed = self.bed.copy()
+        self.original_bed = self.bed
+        self._original_overlap_index = None
+        self._overlap_cache = {}
+        self._sorted = True
 
     def _read_chromsizes(self, fp):
         """
@@ -52,26 +108,34 @@ class Bedshift(object):
         :param str fp: path to the chrom sizes file
         """
         try:
-            with open(fp) as f:
-                for line in f:
-                    line = line.strip().split("\t")
-                    chrom = str(line[0])
-                    size = int(line[1])
-                    self.chrom_lens[chrom] = size
+            df = pd.read_csv(
+                fp,
+                sep="\t",
+                header=None,
+                usecols=[0, 1],
+                dtype={0: str, 1: np.int64},
+            )
         except FileNotFoundError:
             _LOGGER.error("fasta file path {} invalid".format(fp))
             sys.exit(1)
 
-        total_len = sum(self.chrom_lens.values())
-        self.chrom_weights = [
-            chrom_len / total_len for chrom_len in self.chrom_lens.values()
-        ]
+        self.chrom_lens.update(zip(df[0], df[1].tolist()))
+        n_chroms = len(self.chrom_lens)
+        self._chrom_names = np.fromiter(self.chrom_lens, dtype=object, count=n_chroms)
+        self._chrom_lens_arr = np.fromiter(
+            self.chrom_lens.values(), dtype=np.int64, count=n_chroms
+        )
+        self.chrom_weights = self._chrom_lens_arr / self._chrom_lens_arr.sum()
 
     def reset_bed(self):
         """
         Reset the stored bedfile to the state before perturbations
+
+        Perturbations never modify self.bed in place, so the original
+        DataFrame can be shared rather than copied.
         """
-        self.bed = self.original_bed.copy()
+        self.bed = self.original_bed
+        self._sorted = True
 
     def _precheck(self, rate, requiresChromLens=False, isAdd=False):
         """
@@ -94,18 +158,63 @@ class Bedshift(object):
                 _LOGGER.error("chrom.sizes file must be specified")
                 sys.exit(1)
 
+    def _concat_regions(self, frames):
+        """
+        Concatenate region DataFrames into the column types used for self.bed
+
+        Chromosomes and modifications are stored as categoricals, so the
+        chromosome categories are unified across frames before concatenating.
+
+        :param list frames: DataFrames of regions
+        :return pd.DataFrame: the concatenated regions
+        """
+        chroms = set()
+        for frame in frames:
+            if isinstance(frame[0].dtype, pd.CategoricalDtype):
+                chroms.update(frame[0].cat.categories)
+            else:
+                chroms.update(frame[0].unique())
+        dtypes = {
+            0: pd.CategoricalDtype(sorted(chroms)),
+            1: "int64",
+            2: "int64",
+            3: _MODIFICATIONS,
+        }
+        # only cast frames that need it, the retained regions usually do not
+        frames = [
+            (
+                frame
+                if all(frame[col].dtype == dtype for col, dtype in dtypes.items())
+                else frame.astype(dtypes)
+            )
+            for frame in frames
+        ]
+        return pd.concat(frames, ignore_index=True)
+
+    def _rebuild(self, to_drop, new_regions=None):
+        """
+        Replace self.bed with its regions minus the dropped rows, plus new regions
+
+        :param list to_drop: positions of the rows to remove
+        :param pd.DataFrame new_regions: regions to append after the kept rows
+        """
+        keep = np.ones(len(self.bed), dtype=bool)
+        keep[np.asarray(to_drop, dtype=np.int64)] = False
+        kept = self.bed.iloc[keep]
+        if new_regions is None:
+            self.bed = kept.reset_index(drop=True)
+        else:
+            self.bed = self._concat_regions([kept, new_regions])
+
     def pick_random_chroms(self, n):
         """
-        Utility function to pick a random chromosome
+        Utility function to pick random chromosomes, weighted by their length
 
-        :param str n: the number of random chromosomes to pick
-        :return str, float chrom_str, chrom_len: chromosome number and length
+        :param int n: the number of random chromosomes to pick
+        :return np.ndarray, np.ndarray chrom_strs, chrom_lens: chromosome names and lengths
         """
-        chrom_strs = random.choices(
-            list(self.chrom_lens.keys()), weights=self.chrom_weights, k=n
-        )
-        chrom_lens = [self.chrom_lens[chrom_str] for chrom_str in chrom_strs]
-        return zip(chrom_strs, chrom_lens)
+        idx = self._rng.choice(len(self._chrom_names), n, p=self.chrom_weights)
+        return self._chrom_names[idx], self._chrom_lens_arr[idx]
 
     def add(self, addrate, addmean, addstdev, valid_bed=None, delimiter="\t"):
         """
@@ -125,37 +234,31 @@ class Bedshift(object):
 
         rows = self.bed.shape[0]
         num_add = int(rows * addrate)
-        new_regions = {0: [], 1: [], 2: [], 3: []}
         if valid_bed:
             valid_regions = self.read_bed(valid_bed, delimiter)
             valid_regions[3] = valid_regions[2] - valid_regions[1]
             total_bp = valid_regions[3].sum()
-            valid_regions[4] = valid_regions[3].apply(lambda x: x / total_bp)
-            add_rows = random.choices(
-                list(range(len(valid_regions))),
-                weights=list(valid_regions[4]),
-                k=num_add,
+            valid_regions[4] = valid_regions[3] / total_bp
+            add_rows = self._rng.choice(
+                len(valid_regions), num_add, p=valid_regions[4].to_numpy()
             )
-            for row in add_rows:
-                data = valid_regions.loc[row]
-                chrom = data[0]
-                start = random.randint(data[1], data[2])
-                end = start + int(np.random.normal(addmean, addstdev))
-                new_regions[0].append(chrom)
-                new_regions[1].append(start)
-                new_regions[2].append(end)
-                new_regions[3].append("A")
+            chroms = valid_regions[0].to_numpy()[add_rows]
+            starts = self._rng.integers(
+                valid_regions[1].to_numpy(np.int64)[add_rows],
+                valid_regions[2].to_numpy(np.int64)[add_rows],
+                endpoint=True,
+            )
+            lengths = self._rng.normal(addmean, addstdev, num_add).astype(np.int64)
+            ends = starts + lengths
         else:
-            random_chroms = self.pick_random_chroms(num_add)
-            for chrom_str, chrom_len in random_chroms:
-                start = random.randint(1, chrom_len)
-                # ensure chromosome length is not exceeded
-                end = min(start + int(np.random.normal(addmean, addstdev)), chrom_len)
-                new_regions[0].append(chrom_str)
-                new_regions[1].append(start)
-                new_regions[2].append(end)
-                new_regions[3].append("A")
-        self.bed = self.bed.append(pd.DataFrame(new_regions), ignore_index=True)
+            chroms, chrom_lens = self.pick_random_chroms(num_add)
+            starts = self._rng.integers(1, chrom_lens, endpoint=True)
+            lengths = self._rng.normal(addmean, addstdev, num_add).astype(np.int64)
+            # ensure chromosome length is not exceeded
+            ends = np.minimum(starts + lengths, chrom_lens)
+        new_regions = {0: chroms, 1: starts, 2: ends, 3: "A"}
+        self.bed = self._concat_regions([self.bed, pd.DataFrame(new_regions)])
+        self._sorted = False
         return num_add
 
     def add_from_file(self, fp, addrate, delimiter="\t"):
@@ -179,10 +282,11 @@ class Bedshift(object):
                 )
             )
             num_add = dflen
-        add_rows = random.sample(list(range(dflen)), num_add)
+        add_rows = self._rng.choice(dflen, num_add, replace=False)
         add_df = df.loc[add_rows].reset_index(drop=True)
         add_df[3] = pd.Series(["A"] * add_df.shape[0])
-        self.bed = self.bed.append(add_df, ignore_index=True)
+        self.bed = self._concat_regions([self.bed, add_df])
+        self._sorted = False
         return num_add
 
     def shift(self, shiftrate, shiftmean, shiftstdev, shift_rows=[]):
@@ -195,45 +299,40 @@ class Bedshift(object):
         :return int: the number of regions shifted
         """
         self._precheck(shiftrate, requiresChromLens=True)
+        if shiftrate == 0 and len(shift_rows) == 0:
+            return 0
 
         rows = self.bed.shape[0]
         if len(shift_rows) == 0:
-            shift_rows = random.sample(list(range(rows)), int(rows * shiftrate))
-        new_row_list = []
-        to_drop = []
-        num_shifted = 0
-        invalid_shifted = 0
-        for row in shift_rows:
-            drop_row, new_region = self._shift(
-                row, shiftmean, shiftstdev
-            )  # shifted rows display a 1
-            if drop_row is not None and new_region:
-                num_shifted += 1
-                new_row_list.append(new_region)
-                to_drop.append(drop_row)
-            else:
-                invalid_shifted += 1
-        self.bed = self.bed.drop(to_drop)
-        self.bed = self.bed.append(new_row_list, ignore_index=True)
-        self.bed = self.bed.reset_index(drop=True)
+            shift_rows = self._rng.choice(rows, int(rows * shiftrate), replace=False)
+        shift_rows = np.asarray(shift_rows, dtype=np.int64)
+        shifts = self._rng.normal(shiftmean, shiftstdev, len(shift_rows)).astype(
+            np.int64
+        )
+        chroms = self.bed[0].array[shift_rows]
+        # look up lengths once per chromosome category, then gather by code
+        category_lens = self.bed[0].cat.categories.map(self.chrom_lens)
+        chrom_max = category_lens.to_numpy(dtype=np.float64)[chroms.codes]
+        # check if the regions are shifted out of chromosome length bounds
+        new_starts, new_ends, valid = _shift_regions(
+            self.bed[1].to_numpy()[shift_rows],
+            self.bed[2].to_numpy()[shift_rows],
+            chrom_max,
+            shifts,
+        )
+        shifted = pd.DataFrame(
+            {0: chroms[valid], 1: new_starts[valid], 2: new_ends[valid], 3: "S"}
+        )
+        self._rebuild(shift_rows[valid], shifted)
+        self._sorted = False
+        num_shifted = len(shifted)
+        invalid_shifted = len(shift_rows) - num_shifted
         if invalid_shifted > 0:
             _LOGGER.warning(
                 f"{invalid_shifted} regions were prevented from being shifted outside of chromosome boundaries. Reported regions shifted will be less than expected."
             )
         return num_shifted
 
-    def _shift(self, row, mean, stdev):
-        theshift = int(np.random.normal(mean, stdev))
-
-        chrom = self.bed.loc[row][0]
-        start = self.bed.loc[row][1]
-        end = self.bed.loc[row][2]
-        if start + theshift < 0 or end + theshift > self.chrom_lens[str(chrom)]:
-            # check if the region is shifted out of chromosome length bounds
-            return None, None
-
-        return row, {0: chrom, 1: start + theshift, 2: end + theshift, 3: "S"}
-
     def shift_from_file(self, fp, shiftrate, shiftmean, shiftstdev, delimiter="\t"):
         """
         Shift regions that overlap the specified file's regions
@@ -246,18 +345,18 @@ class Bedshift(object):
         :return int: the number of regions shifted
         """
         self._precheck(shiftrate, requiresChromLens=True)
+        if shiftrate == 0:
+            return 0
 
         rows = self.bed.shape[0]
         num_shift = int(rows * shiftrate)
 
-        intersect_regions = self._find_overlap(fp)
-        original_colnames = self.bed.columns
-        intersect_regions.columns = [str(col) for col in intersect_regions.columns]
-        self.bed.columns = [str(col) for col in self.bed.columns]
-        indices_of_overlap_regions = self.bed.reset_index().merge(intersect_regions)[
-            "index"
-        ]
-        self.bed.columns = [int(col) for col in self.bed.columns]
+        intersect_regions = self._find_overlap(fp, delimiter=delimiter)
+        indices_of_overlap_regions = (
+            self.bed.rename(columns=str)
+            .reset_index()
+            .merge(intersect_regions.rename(columns=str))["index"]
+        )
 
         interlen = len(indices_of_overlap_regions)
         if num_shift > interlen:
@@ -269,7 +368,9 @@ class Bedshift(object):
             num_shift = len(indices_of_overlap_regions)
 
         elif interlen > num_shift:
-            indices_of_overlap_regions = indices_of_overlap_regions.sample(n=num_shift)
+            indices_of_overlap_regions = indices_of_overlap_regions.sample(
+                n=num_shift, random_state=self._rng
+            )
 
         indices_of_overlap_regions = indices_of_overlap_regions.to_list()
 
@@ -283,47 +384,28 @@ class Bedshift(object):
         :return int: the number of regions cut
         """
         self._precheck(cutrate)
+        if cutrate == 0:
+            return 0
 
         rows = self.bed.shape[0]
-        cut_rows = random.sample(list(range(rows)), int(rows * cutrate))
-        new_row_list = []
-        to_drop = []
-        for row in cut_rows:
-            drop_row, new_regions = self._cut(row)  # cut rows display a 2
-            new_row_list.extend(new_regions)
-            to_drop.append(drop_row)
-        self.bed = self.bed.drop(to_drop)
-        self.bed = self.bed.append(new_row_list, ignore_index=True)
-        self.bed = self.bed.reset_index(drop=True)
-        return len(cut_rows)
-
-    def _cut(self, row):
-        chrom = self.bed.loc[row][0]
-        start = self.bed.loc[row][1]
-        end = self.bed.loc[row][2]
-
-        # choose where to cut the region
-        thecut = (
-            start + end
-        ) // 2  # int(np.random.normal((start+end)/2, (end - start)/6))
-        if thecut <= start:
-            thecut = start + 10
-        if thecut >= end:
-            thecut = end - 10
-
-        """ may add in later, this makes the api confusing!
-        # adjust the cut regions using the shift function
-        new_segs = self.__shift(new_segs, 0, meanshift, stdevshift)
-        new_segs = self.__shift(new_segs, 1, meanshift, stdevshift)
-        """
-
-        return (
-            row,
-            [
-                {0: chrom, 1: start, 2: thecut, 3: "C"},
-                {0: chrom, 1: thecut, 2: end, 3: "C"},
-            ],
+        cut_rows = self._rng.choice(rows, int(rows * cutrate), replace=False)
+        starts = self.bed[1].to_numpy()[cut_rows]
+        ends = self.bed[2].to_numpy()[cut_rows]
+
+        thecuts = _cut_points(starts, ends)
+
+        # each cut region is replaced by its two halves, placed next to each other
+        cut_regions = pd.DataFrame(
+            {
+                0: self.bed[0].array[np.repeat(cut_rows, 2)],
+                1: np.column_stack([starts, thecuts]).ravel(),
+                2: np.column_stack([thecuts, ends]).ravel(),
+                3: "C",
+            }
         )
+        self._rebuild(cut_rows, cut_regions)
+        self._sorted = False
+        return len(cut_rows)
 
     def merge(self, mergerate):
         """
@@ -333,33 +415,29 @@ class Bedshift(object):
         :return int: number of regions merged
         """
         self._precheck(mergerate)
+        if mergerate == 0:
+            return 0
 
         rows = self.bed.shape[0]
-        merge_rows = random.sample(list(range(rows)), int(rows * mergerate))
-        to_add = []
-        to_drop = []
-        for row in merge_rows:
-            drop_rows, add_row = self._merge(row)
-            if drop_rows and add_row:
-                to_add.append(add_row)
-                to_drop.extend(drop_rows)
-        self.bed = self.bed.drop(to_drop)
-        self.bed = self.bed.append(to_add, ignore_index=True)
-        self.bed = self.bed.reset_index(drop=True)
-        return len(to_drop)
-
-    def _merge(self, row):
+        merge_rows = self._rng.choice(rows, int(rows * mergerate), replace=False)
+        chrom_codes = self.bed[0].cat.codes.to_numpy()
         # check if the regions being merged are on the same chromosome
-        if (
-            row + 1 not in self.bed.index
-            or self.bed.loc[row][0] != self.bed.loc[row + 1][0]
-        ):
-            return None, None
-
-        chrom = self.bed.loc[row][0]
-        start = self.bed.loc[row][1]
-        end = self.bed.loc[row + 1][2]
-        return [row, row + 1], {0: chrom, 1: start, 2: end, 3: "M"}
+        same_next = np.zeros(rows, dtype=bool)
+        same_next[:-1] = chrom_codes[:-1] == chrom_codes[1:]
+        merge_rows = merge_rows[same_next[merge_rows]]
+
+        merged_regions = pd.DataFrame(
+            {
+                0: self.bed[0].array[merge_rows],
+                1: self.bed[1].to_numpy()[merge_rows],
+                2: self.bed[2].to_numpy()[merge_rows + 1],
+                3: "M",
+            }
+        )
+        to_drop = np.concatenate([merge_rows, merge_rows + 1])
+        self._rebuild(to_drop, merged_regions)
+        self._sorted = False
+        return len(to_drop)
 
     def drop(self, droprate):
         """
@@ -369,11 +447,12 @@ class Bedshift(object):
         :return int: the number of rows dropped
         """
         self._precheck(droprate)
+        if droprate == 0:
+            return 0
 
         rows = self.bed.shape[0]
-        drop_rows = random.sample(list(range(rows)), int(rows * droprate))
-        self.bed = self.bed.drop(drop_rows)
-        self.bed = self.bed.reset_index(drop=True)
+        drop_rows = self._rng.choice(rows, int(rows * droprate), replace=False)
+        self._rebuild(drop_rows)
         return len(drop_rows)
 
     def drop_from_file(self, fp, droprate, delimiter="\t"):
@@ -385,19 +464,18 @@ class Bedshift(object):
         :return int: the number of regions dropped
         """
         self._precheck(droprate)
+        if droprate == 0:
+            return 0
 
         rows = self.bed.shape[0]
         num_drop = int(rows * droprate)
-        drop_bed = self.read_bed(fp, delimiter=delimiter)
-
-        intersect_regions = self._find_overlap(drop_bed)
-        original_colnames = self.bed.columns
-        intersect_regions.columns = [str(col) for col in intersect_regions.columns]
-        self.bed.columns = [str(col) for col in self.bed.columns]
-        indices_of_overlap_regions = self.bed.reset_index().merge(intersect_regions)[
-            "index"
-        ]
-        self.bed.columns = [int(col) for col in self.bed.columns]
+
+        intersect_regions = self._find_overlap(fp, delimiter=delimiter)
+        indices_of_overlap_regions = (
+            self.bed.rename(columns=str)
+            .reset_index()
+            .merge(intersect_regions.rename(columns=str))["index"]
+        )
 
         interlen = len(indices_of_overlap_regions)
         if num_drop > interlen:
@@ -408,61 +486,98 @@ class Bedshift(object):
             )
             num_drop = len(indices_of_overlap_regions)
         elif interlen > num_drop:
-            indices_of_overlap_regions = indices_of_overlap_regions.sample(n=num_drop)
+            indices_of_overlap_regions = indices_of_overlap_regions.sample(
+                n=num_drop, random_state=self._rng
+            )
         indices_of_overlap_regions = indices_of_overlap_regions.to_list()
 
-        self.bed = self.bed.drop(indices_of_overlap_regions)
+        self._rebuild(indices_of_overlap_regions)
         return num_drop
 
 
     def set_seed(self, seednum):
-        try:
-            seednum = int(seednum)
-            random.seed(seednum)
-            np.random.seed(seednum)
-        except ValueError:
-            _LOGGER.error("Seed should be an integer, not {}.".format(type(seednum)))
-            sys.exit(1)
+        """
+        Reseed the random number generator used by the perturbations
+
+        :param int seednum: the seed
+        """
+        self._rng = np.random.default_rng(_parse_seed(seednum))
 
 
-    def _find_overlap(self, fp, reference=None):
+    def _find_overlap(self, fp, reference=None, delimiter="\t"):
         """
         Find intersecting regions between the reference bedfile and the comparison file provided in the yaml config file.
 
+        Results for a comparison file against the original BED file are cached,
+        since the original BED file never changes.
+
         :param str fp: path to file, or pandas DataFrame, for comparison
         :param str reference: path to file, or pandas DataFrame, for reference. If None, then defaults to the original BED file provided to the Bedshift constructor
+        :param str delimiter: the delimiter used in fp
         :return pd.DataFrame: a DataFrame of overlapping regions
         """
+        cache_key = None
+        if reference is None and isinstance(fp, str):
+            cache_key = (fp, delimiter)
+            if cache_key in self._overlap_cache:
+                return self._overlap_cache[cache_key]
         if reference is None:
-            reference_bed = self.original_bed.copy()
+            reference_bed = self.original_bed
+            if self._original_overlap_index is None:
+                self._original_overlap_index = self._build_overlap_index(reference_bed)
+            reference_index = self._original_overlap_index
         else:
             if isinstance(reference, pd.DataFrame):
-                reference_bed = reference.copy()
+                reference_bed = reference
             elif isinstance(reference, str):
                 reference_bed = self.read_bed(reference)
             else:
                 raise Exception("unsupported input type: {}".format(type(reference)))
+            reference_index = self._build_overlap_index(reference_bed)
         if isinstance(fp, pd.DataFrame):
-            comparison_bed = fp.copy()
+            comparison_bed = fp
         elif isinstance(fp, str):
-            comparison_bed = self.read_bed(fp)
+            comparison_bed = self.read_bed(fp, delimiter=delimiter)
         else:
             raise Exception("unsupported input type: {}".format(type(reference)))
-        reference_bed.columns = ["Chromosome", "Start", "End", "modifications"]
-        comparison_bed.columns = ["Chromosome", "Start", "End", "modifications"]
-        reference_pr = pr.PyRanges(reference_bed)
-        comparison_pr = pr.PyRanges(comparison_bed)
-        intersection = reference_pr.overlap(comparison_pr, how="first").as_df()
-        if len(intersection) == 0:
+        comparison_starts = comparison_bed[1].to_numpy().astype(np.int64)
+        comparison_ends = comparison_bed[2].to_numpy().astype(np.int64)
+        hits = []
+        comparison_groups = comparison_bed.groupby(0, sort=False, observed=True)
+        for chrom, rows in comparison_groups.indices.items():
+            if chrom not in reference_index:
+                continue
+            _, reference_rows = reference_index[chrom].all_overlaps_both(
+                comparison_starts[rows], comparison_ends[rows], rows.astype(np.int64)
+            )
+            hits.append(reference_rows)
+        overlap_rows = np.unique(np.concatenate(hits)) if hits else []
+        if len(overlap_rows) == 0:
             raise Exception(
                 "no intersection found between {} and {}".format(
                     reference_bed, comparison_bed
                 )
             )
-        intersection = intersection.drop(["modifications"], axis=1)
+        intersection = reference_bed.iloc[overlap_rows, :3].reset_index(drop=True)
         intersection.columns = [0, 1, 2]
+        if cache_key is not None:
+            self._overlap_cache[cache_key] = intersection
         return intersection
 
+    def _build_overlap_index(self, bed):
+        """
+        Build an NCLS interval index for each chromosome of a BED DataFrame
+
+        :param pd.DataFrame bed: the regions to index
+        :return dict: chromosome mapped to an NCLS index of row positions in bed
+        """
+        starts = bed[1].to_numpy().astype(np.int64)
+        ends = bed[2].to_numpy().astype(np.int64)
+        return {
+            chrom: NCLS(starts[rows], ends[rows], rows.astype(np.int64))
+            for chrom, rows in bed.groupby(0, sort=False, observed=True).indices.items()
+        }
+
     def all_perturbations(
         self,
         addrate=0.0,
@@ -536,7 +651,31 @@ class Bedshift(object):
 
         :param str outfile_name: The name of the output BED file
         """
-        self.bed.sort_values([0, 1, 2], inplace=True)
+        # drops keep the regions sorted, other perturbations append out of order
+        if not self._sorted:
+            self.bed = self.bed.sort_values([0, 1, 2]).reset_index(drop=True)
+            self._sorted = True
+        # pyarrow's CSV writer is much faster than to_csv on large files
+        try:
+            import pyarrow as pa
+            import pyarrow.csv as pcsv
+
+            write_options = pcsv.WriteOptions(
+                include_header=False, delimiter="\t", quoting_style="none"
+            )
+        except (ImportError, TypeError):
+            # pyarrow is optional, and older versions lack quoting_style
+            pa = None
+        if pa is not None:
+            try:
+                pcsv.write_csv(
+                    pa.Table.from_pandas(self.bed, preserve_index=False),
+                    outfile_name,
+                    write_options=write_options,
+                )
+                return
+            except pa.ArrowException:
+                pass
         self.bed.to_csv(
             outfile_name, sep="\t", header=False, index=False, float_format="%.0f"
         )
@@ -548,12 +687,26 @@ class Bedshift(object):
         :param str bedfile_path: The path to the BED file
         """
         try:
+            # the C parser only handles single character delimiters
+            engine = "c" if len(delimiter) == 1 else "python"
+            # if there is a header line in the table, skip it
+            first_row = pd.read_csv(
+                bedfile_path,
+                sep=delimiter,
+                header=None,
+                usecols=[0, 1, 2],
+                nrows=1,
+                engine=engine,
+            )
+            has_header = not str(first_row.iloc[0, 1]).isdigit()
             df = pd.read_csv(
                 bedfile_path,
                 sep=delimiter,
                 header=None,
+                skiprows=1 if has_header else 0,
                 usecols=[0, 1, 2],
-                engine="python",
+                dtype={0: str, 1: np.int64, 2: np.int64},
+                engine=engine,
             )
         except FileNotFoundError:
             _LOGGER.error("BED file path {} invalid".format(bedfile_path))
@@ -562,14 +715,79 @@ class Bedshift(object):
             _LOGGER.error("file {} could not be read".format(bedfile_path))
             sys.exit(1)
 
-        # if there is a header line in the table, remove it
-        if not str(df.iloc[0, 1]).isdigit():
-            df = df[1:].reset_index(drop=True)
-
         df[3] = "-"  # column indicating which modifications were made
         return df
 
 
+_repeat_state = {}
+
+
+class _RepetitionError(Exception):
+    """A repetition run by _run_repeat exited with an error"""
+
+
+def _check_perturbations(bedshifter, perturbations):
+    """
+    Check perturbation rates and input files before running repetitions
+
+    Worker processes cannot exit the program, so problems that would make
+    a perturbation call sys.exit are caught here instead.
+
+    :param bedshift.Bedshift bedshifter: the Bedshift instance to perturb
+    :param dict perturbations: keyword arguments for Bedshift.all_perturbations
+    """
+    add_needs_chrom_lens = perturbations["addrate"] > 0 and not (
+        perturbations["addfile"] or perturbations["valid_regions"]
+    )
+    bedshifter._precheck(
+        perturbations["addrate"], requiresChromLens=add_needs_chrom_lens, isAdd=True
+    )
+    bedshifter._precheck(
+        perturbations["shiftrate"], requiresChromLens=perturbations["shiftrate"] > 0
+    )
+    for rate in ["cutrate", "mergerate", "droprate"]:
+        bedshifter._precheck(perturbations[rate])
+    for fp_key in ["addfile", "valid_regions", "shiftfile", "dropfile", "yaml"]:
+        fp = perturbations[fp_key]
+        if fp and not os.path.isfile(fp):
+            _LOGGER.error("File '{}' does not exist.".format(fp))
+            sys.exit(1)
+
+
+def _init_repeat_worker(bedshifter, perturbations):
+    """
+    Store the objects shared by all repetitions in a worker process
+
+    :param bedshift.Bedshift bedshifter: the Bedshift instance to perturb
+    :param dict perturbations: keyword arguments for Bedshift.all_perturbations
+    """
+    _repeat_state["bedshifter"] = bedshifter
+    _repeat_state["perturbations"] = perturbations
+
+
+def _run_repeat(job):
+    """
+    Perform one repetition of the perturbations and write it to a BED file
+
+    :param tuple job: the np.random.SeedSequence and output path of the repetition
+    :return str: the output path
+    """
+    seed, outfile_path = job
+    bedshifter = _repeat_state["bedshifter"]
+    bedshifter._rng = np.random.default_rng(seed)
+    try:
+        bedshifter.all_perturbations(**_repeat_state["perturbations"])
+        bedshifter.to_bed(outfile_path)
+    except SystemExit:
+        # a SystemExit would kill a pool worker and leave its task unfinished
+        raise _RepetitionError(
+            "Repetition for {} could not be generated".format(outfile_path)
+        )
+    finally:
+        bedshifter.reset_bed()
+    return outfile_path
+
+
 def main():
     """ Primary workflow """
 
@@ -638,52 +856,80 @@ def main():
     bedshifter = Bedshift(args.bedfile, args.chrom_lengths)
     _LOGGER.info(f"Generating {args.repeat} repetitions...")
 
-    pct_reports = [int(x * args.repeat / 100) for x in [5, 25, 50, 75, 100]]
+    perturbations = dict(
+        addrate=args.addrate,
+        addmean=args.addmean,
+        addstdev=args.addstdev,
+        addfile=args.addfile,
+        valid_regions=args.valid_regions,
+        shiftrate=args.shiftrate,
+        shiftmean=args.shiftmean,
+        shiftstdev=args.shiftstdev,
+        shiftfile=args.shiftfile,
+        cutrate=args.cutrate,
+        mergerate=args.mergerate,
+        droprate=args.droprate,
+        dropfile=args.dropfile,
+        yaml=args.yaml_config,
+    )
 
-    for i in range(args.repeat):
-        n = bedshifter.all_perturbations(
-            args.addrate,
-            args.addmean,
-            args.addstdev,
-            args.addfile,
-            args.valid_regions,
-            args.shiftrate,
-            args.shiftmean,
-            args.shiftstdev,
-            args.shiftfile,
-            args.cutrate,
-            args.mergerate,
-            args.droprate,
-            args.dropfile,
-            args.yaml_config,
-            args.seed
-        )
-        if args.repeat == 1:
-            bedshifter.to_bed(outfile_base)
-            _LOGGER.info(
-                "REGION COUNT | original: {}\tnew: {}\tchanged: {}\t\noutput file: {}".format(
-                    bedshifter.original_num_regions,
-                    bedshifter.bed.shape[0],
-                    str(n),
-                    outfile_base,
-                )
+    if args.repeat == 1:
+        n = bedshifter.all_perturbations(**perturbations, seed=args.seed)
+        bedshifter.to_bed(outfile_base)
+        _LOGGER.info(
+            "REGION COUNT | original: {}\tnew: {}\tchanged: {}\t\noutput file: {}".format(
+                bedshifter.original_num_regions,
+                bedshifter.bed.shape[0],
+                str(n),
+                outfile_base,
             )
-        else:
-            basename, ext = os.path.splitext(os.path.basename(outfile_base))
-            dirname = os.path.dirname(outfile_base)
-            digits = int(math.log10(args.repeat)) + 1
+        )
+        return
+
+    seed = None if args.seed is None else _parse_seed(args.seed)
+    # independent, reproducible random streams for each repetition
+    seeds = np.random.SeedSequence(seed).spawn(args.repeat)
+
+    basename, ext = os.path.splitext(os.path.basename(outfile_base))
+    dirname = os.path.dirname(outfile_base)
+    digits = int(math.log10(args.repeat)) + 1
+    outfile_paths = [
+        os.path.join(dirname, f"{basename}_rep{str(i + 1).zfill(digits)}{ext}")
+        for i in range(args.repeat)
+    ]
 
-            rep = str(i + 1).zfill(digits)
-            modified_outfile_path = os.path.join(dirname, f"{basename}_rep{rep}{ext}")
-            bedshifter.to_bed(modified_outfile_path)
+    pct_reports = [int(x * args.repeat / 100) for x in [5, 25, 50, 75, 100]]
+
+    _check_perturbations(bedshifter, perturbations)
 
+    # repetitions are independent, so run them in worker processes that each
+    # get the already loaded Bedshift object
+    jobs = zip(seeds, outfile_paths)
+    processes = min(args.repeat, os.cpu_count() or 1)
+    pool = None
+    if processes == 1:
+        _init_repeat_worker(bedshifter, perturbations)
+        finished = map(_run_repeat, jobs)
+    else:
+        pool = multiprocessing.Pool(
+            processes,
+            initializer=_init_repeat_worker,
+            initargs=(bedshifter, perturbations),
+        )
+        finished = pool.imap(_run_repeat, jobs)
+    try:
+        for i, modified_outfile_path in enumerate(finished):
             pct_finished = int((100 * (i + 1)) / args.repeat)
             if i + 1 in pct_reports:
                 _LOGGER.info(
                     f"Rep {i+1}. Finished: {pct_finished}%. Output file: {modified_outfile_path}"
                 )
-
-        bedshifter.reset_bed()
+    except _RepetitionError as e:
+        _LOGGER.error(str(e))
+        sys.exit(1)
+    finally:
+        if pool is not None:
+            pool.terminate()
 
 
 if __name__ == "__main__":
@@ -1,5 +1,11 @@
+import importlib.util
 import unittest
 import os
+import sys
+import tempfile
+from unittest import mock
+
+import pandas as pd
 
 from bedshift import bedshift
 from bedshift import BedshiftYAMLHandler
@@ -109,6 +115,54 @@ class TestBedshift(unittest.TestCase):
         self.bs.to_bed('tests/py_output.bed')
         self.assertTrue(os.path.exists('tests/py_output.bed'))
 
+    def read_output(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            outfile = os.path.join(tmpdir, 'out.bed')
+            self.bs.to_bed(outfile)
+            return pd.read_csv(outfile, sep='\t', header=None)
+
+    def check_to_bed_format(self):
+        self.bs.all_perturbations(addrate=0.1, shiftrate=0.1, cutrate=0.1, mergerate=0.1)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            outfile = os.path.join(tmpdir, 'out.bed')
+            self.bs.to_bed(outfile)
+            with open(outfile) as f:
+                written = f.read()
+        self.assertEqual(written, self.bs.bed.to_csv(sep='\t', header=False, index=False))
+        self.bs.reset_bed()
+
+    def test_to_bed_format(self):
+        self.check_to_bed_format()
+
+    def test_to_bed_format_without_pyarrow(self):
+        with mock.patch.dict(sys.modules, {'pyarrow': None, 'pyarrow.csv': None}):
+            self.check_to_bed_format()
+
+    @unittest.skipUnless(importlib.util.find_spec('pyarrow'), 'pyarrow not installed')
+    def test_to_bed_format_old_pyarrow(self):
+        with mock.patch('pyarrow.csv.WriteOptions', side_effect=TypeError):
+            self.check_to_bed_format()
+
+    def test_to_bed_sorted(self):
+        perturbations = [
+            lambda: self.bs.add(0.1, 100, 20),
+            lambda: self.bs.shift(0.1, 200, 30),
+            lambda: self.bs.cut(0.1),
+            lambda: self.bs.merge(0.1),
+        ]
+        for perturb in perturbations:
+            perturb()
+            written = self.read_output()
+            self.assertTrue(written.equals(written.sort_values([0, 1, 2]).reset_index(drop=True)))
+            self.bs.reset_bed()
+
+    def test_to_bed_after_drop(self):
+        self.bs.drop(0.3)
+        expected = self.bs.bed[[0, 1, 2, 3]].astype({0: str, 3: str}).reset_index(drop=True)
+        written = self.read_output()
+        self.assertTrue(written.equals(expected))
+        self.bs.reset_bed()
+
     def test_small_file(self):
         bs_small = bedshift.Bedshift('tests/small_test.bed', chrom_sizes="tests/hg38.chrom.sizes")
         shifted = bs_small.shift(0.3, 50, 50)
@@ -122,6 +176,20 @@ class TestBedshift(unittest.TestCase):
         added = bs_small.add(2.0, 100, 50)
         self.assertEqual(added, 4)
 
+    def test_seed(self):
+        perturbations = dict(addrate=0.2, shiftrate=0.2, cutrate=0.1, mergerate=0.1, droprate=0.1)
+        beds = []
+        for seed in [1, 1, 2]:
+            bs = bedshift.Bedshift('tests/test.bed', chrom_sizes="tests/hg38.chrom.sizes", seed=seed)
+            bs.all_perturbations(**perturbations)
+            beds.append(bs.bed)
+        self.assertTrue(beds[0].equals(beds[1]))
+        self.assertFalse(beds[0].equals(beds[2]))
+
+    def test_invalid_seed(self):
+        self.assertRaises(SystemExit, self.bs.set_seed, -1)
+        self.assertRaises(SystemExit, self.bs.set_seed, "abc")
+
 
 class TestBedshiftYAMLHandler(unittest.TestCase):
     def test_handle_yaml(self):
@@ -146,3 +214,50 @@ class TestBedshiftYAMLHandler(unittest.TestCase):
         # yamled and total both should be around 16750, but can vary by over 100
         self.assertAlmostEqual(yamled, total, places=-3)
         bedshifter.reset_bed()
+
+
+class TestMain(unittest.TestCase):
+    def run_main(self, *args):
+        argv = ['bedshift', '-b', 'tests/test.bed', '-l', 'tests/hg38.chrom.sizes'] + list(args)
+        with mock.patch.object(sys, 'argv', argv):
+            bedshift.main()
+
+    def read_outputs(self, outfile):
+        basename, ext = os.path.splitext(outfile)
+        outputs = []
+        for rep in ['1', '2']:
+            path = f'{basename}_rep{rep}{ext}'
+            self.assertTrue(os.path.exists(path))
+            with open(path) as f:
+                outputs.append(f.read())
+        return outputs
+
+    def test_repeat_seed(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            outfile = os.path.join(tmpdir, 'out.bed')
+            self.run_main('-a', '0.1', '-s', '0.1', '-c', '0.1', '-r', '2', '--seed', '3', '-o', outfile)
+            first = self.read_outputs(outfile)
+            self.assertNotEqual(first[0], first[1])
+            self.run_main('-a', '0.1', '-s', '0.1', '-c', '0.1', '-r', '2', '--seed', '3', '-o', outfile)
+            self.assertEqual(first, self.read_outputs(outfile))
+
+    def test_repeat_invalid_rate(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            outfile = os.path.join(tmpdir, 'out.bed')
+            self.assertRaises(SystemExit, self.run_main, '-c', '1.5', '-r', '3', '-o', outfile)
+
+    def test_repeat_invalid_seed(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            outfile = os.path.join(tmpdir, 'out.bed')
+            self.assertRaises(SystemExit, self.run_main, '-a', '0.1', '-r', '3', '--seed', '-5', '-o', outfile)
+
+    def test_repeat_failure_in_repetition(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            # the file exists, so only reading it inside a repetition fails
+            malformed = os.path.join(tmpdir, 'malformed.bed')
+            with open(malformed, 'w') as f:
+                f.write('chr1\t100\t200\nchr1\tnot_a_number\t300\n')
+            outfile = os.path.join(tmpdir, 'out.bed')
+            # force a worker pool even on single core machines
+            with mock.patch('os.cpu_count', return_value=2):
+                self.assertRaises(SystemExit, self.run_main, '-a', '0.1', '--valid-regions', malformed, '-r', '2', '-o', outfile)